@@ -1,16 +1,14 @@
-import os
+from typing import List, Tuple
 
 import pygame
 
 from .drawable import Drawable
+from .images import load
 
 
 class Background(Drawable):
     def __init__(self):
-        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                            "images", "background.png")
-        raw_image = pygame.image.load(path)
-        self.background_image = pygame.transform.scale2x(raw_image)
+        self.background_image = load("background")
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.background_image, (0, 0))
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        return [(self.background_image, (0, 0))]
@@ -1,8 +1,9 @@
-import os
+from typing import List, Tuple
 
 import pygame
 
 from .drawable import Drawable
+from .images import load
 from .movable import Movable
 
 
@@ -10,10 +11,7 @@ class Base(Drawable, Movable):
     def __init__(self, y: int):
         self.y = y
 
-        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                            "images", "base.png")
-        raw_image = pygame.image.load(path)
-        self.base_image = pygame.transform.scale2x(raw_image)
+        self.base_image = load("base")
 
         self.velocity = 5
         self.width = self.base_image.get_width()
@@ -22,9 +20,9 @@ class Base(Drawable, Movable):
         self.x1 = 0
         self.x2 = self.width
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.image, (self.x1, self.y))
-        surface.blit(self.image, (self.x2, self.y))
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        return [(self.image, (self.x1, self.y)),
+                (self.image, (self.x2, self.y))]
 
     def move(self) -> None:
         self.x1 -= self.velocity
@@ -1,8 +1,9 @@
-import os
+from typing import List, Tuple
 
 import pygame
 
 from .drawable import Drawable
+from .images import load
 from .movable import Movable
 
 
@@ -11,21 +12,8 @@ class Bird(Drawable, Movable):
         self.x = x
         self.y = y
 
-        upflap_path = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "images", "upflap.png")
-        midflap_path = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "images", "midflap.png")
-        downflap_path = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "images", "downflap.png")
-
-        sprites = [upflap_path, midflap_path, downflap_path]
-
-        raw_images = [pygame.image.load(sprite) for sprite in sprites]
-        self.bird_images = [pygame.transform.scale2x(image)
-                            for image in raw_images]
+        sprites = ["upflap", "midflap", "downflap"]
+        self.bird_images = [load(sprite) for sprite in sprites]
 
         self.images = self.bird_images
         self.max_rotation = 25
@@ -35,18 +23,21 @@ class Bird(Drawable, Movable):
         self.tilt = 0
         self.tick_count = 0
         self.velocity = 0
+        self.displacement = 0
         self.height = self.y
 
         self.image_count = 0
 
         self.image = self.images[0]
+        # the flap sprites share one size, whichever is currently shown
+        self.image_width, self.image_height = self.image.get_size()
 
     def jump(self) -> None:
         self.velocity = -10.5
         self.tick_count = 0
         self.height = self.y
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
         self.image_count += 1
 
         if self.image_count < self.animation_time:
@@ -68,7 +59,7 @@ class Bird(Drawable, Movable):
         rotated_image = pygame.transform.rotate(self.image, self.tilt)
         new_rect = rotated_image.get_rect(
             center=self.image.get_rect(topleft=(self.x, self.y)).center)
-        surface.blit(rotated_image, new_rect.topleft)
+        return [(rotated_image, new_rect.topleft)]
 
     def move(self) -> None:
         self.tick_count += 1
@@ -81,6 +72,7 @@ class Bird(Drawable, Movable):
         if displacement < 0:
             displacement -= 2
 
+        self.displacement = displacement
         self.y += displacement
 
         if displacement < 0:
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 import pygame
 
 from abc import ABC, abstractmethod
@@ -6,5 +8,5 @@ from abc import ABC, abstractmethod
 class Drawable(ABC):
 
     @abstractmethod
-    def draw(self, window: pygame.Surface) -> None:
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
         pass
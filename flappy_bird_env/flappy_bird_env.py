@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, SupportsFloat, Tuple
+from typing import Any, Dict, List, Literal, SupportsFloat, Tuple
 from gymnasium.core import ActType, ObsType, RenderFrame
 
-import functools
+import math
+
+from types import SimpleNamespace
 
 import gymnasium as gym
 import numpy as np
@@ -15,6 +17,31 @@ from .bird import Bird
 from .pipe import Pipe
 
 
+def _dist_sq(bird_x: float, bird_y: float, pipe_x: float,
+             gap_center_y: float) -> float:
+    return (bird_y - gap_center_y) ** 2 + (bird_x - pipe_x + 150) ** 2
+
+
+def _above_line(point_x: float, point_y: float, x1: float, y1: float,
+                x2: float, y2: float) -> bool:
+    """
+    Check if a point is above or below the line through (x1, y1) and (x2, y2),
+    where x2 > x1.
+
+    Sign of the cross product between the line direction and the vector to the
+    point: equivalent to comparing against the line's y value at point_x,
+    without dividing by the slope.
+    """
+    return (x2 - x1) * (point_y - y1) - (y2 - y1) * (point_x - x1) > 0
+
+
+def _in_pipe_but_off_center(bird_x: float, bird_y: float, pipe_x: float,
+                            gap_center_y: float) -> bool:
+    in_pipe = pipe_x - 64 < bird_x < pipe_x + 100
+    off_center = not (gap_center_y - 40 < bird_y < gap_center_y + 40)
+    return in_pipe and off_center
+
+
 class FlappyBirdEnv(gym.Env):
     action_space = Discrete(2)
     """
@@ -29,21 +56,38 @@ class FlappyBirdEnv(gym.Env):
     should be contained with the space. It is static across all instances.
     """
 
+    _height, _width = observation_space.shape[:2]
+    _shape = (_width, _height)
+
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
     """
     The metadata of the environment containing rendering modes, rendering fps,
     etc.
     """
 
-    def __init__(self, render_mode: str | None = None):
+    def __init__(self, render_mode: str | None = None,
+                 observation_mode: Literal["pixels", "features"] = "pixels"):
         self.render_mode = render_mode
 
+        if observation_mode == "features":
+            self.observation_space = Box(low=-np.inf, high=np.inf, shape=(4,),
+                                         dtype=np.float32)
+        elif observation_mode != "pixels":
+            raise ValueError("Invalid observation mode")
+        self.observation_mode = observation_mode
+
         self._background = None
         self._pipes = None
+        self._pipe_pool: List[Pipe] = []
         self._base = None
         self._bird = None
-        self._old_distance = np.inf
+        self._cached = SimpleNamespace(pipe0_x=0, gap_center_y=0.0, bird_x=0,
+                                       bird_y=0.0)
+        self._old_distance_sq = math.inf
         self._surface = None
+        self._dirty = True
+        self._drawn_rects = None
+        self._previous_rects = None
         self._clock = None
         if self.render_mode == "human":
             self._clock = pygame.time.Clock()
@@ -53,30 +97,49 @@ class FlappyBirdEnv(gym.Env):
 
     @property
     def observation(self) -> ObsType:
+        if self.observation_mode == "features":
+            bird = self._bird
+            pipe = next((pipe for pipe in self._pipes if not pipe.passed),
+                        self._pipes[-1])
+            return np.array([bird.y, bird.displacement, pipe.x - bird.x,
+                             pipe.gap_center_y], dtype=np.float32)
+
+        return self._pixels()
+
+    def _pixels(self) -> np.ndarray:
+        self._redraw()
+
+        # pixels3d returns a (width, height, 3) view that locks the surface;
+        # copy it out in row-major order and drop the view to release the lock
         pixels = pygame.surfarray.pixels3d(self._surface)
-        return np.transpose(np.array(pixels), axes=(1, 0, 2))
+        observation = np.ascontiguousarray(pixels.swapaxes(0, 1))
+        del pixels
+        return observation
 
     @property
     def reward(self) -> SupportsFloat:
+        return self._compute_reward(self.terminated)
 
-        new_distance = self._calculate_distance()
+    def _compute_reward(self, terminated: bool) -> SupportsFloat:
+        new_distance_sq = self._distance_sq()
 
         if self._is_pipe_passed():
             return 1
-        elif self.terminated:
-            self._old_distance = np.inf
+        elif terminated:
+            self._old_distance_sq = math.inf
             return -1
-        elif new_distance <= self._old_distance:
-            self._old_distance = new_distance
-            return self._calculate_distance_reward()
+        elif new_distance_sq <= self._old_distance_sq:
+            self._old_distance_sq = new_distance_sq
+            return (410 - math.sqrt(new_distance_sq)) / 410
         else:
             return 0
 
     @property
     def terminated(self) -> bool:
-        return any([*[pipe.collide(self._bird) for pipe in self._pipes],
-                    self._bird.y + self._bird.image.get_height() >= 730,
-                    self._bird.y < 0])
+        bird_y = self._bird.y
+        if bird_y < 0 or bird_y + self._bird.image_height >= 730:
+            return True
+        return any(pipe.collide(self._bird) for pipe in self._pipes)
 
     @property
     def truncated(self) -> bool:
@@ -106,12 +169,27 @@ class FlappyBirdEnv(gym.Env):
             "last_action": self._last_action,
             "score": self._score
         }
-    
+
     def _is_pipe_passed(self) -> bool:
         return any(not pipe.passed and pipe.x < self._bird.x for pipe in self._pipes)
 
+    def _spawn_pipe(self) -> Pipe:
+        # recycle offscreen pipes instead of reloading their images and masks
+        if self._pipe_pool:
+            pipe = self._pipe_pool.pop()
+            pipe.reset(700, self.np_random)
+            return pipe
+        return Pipe(700, self.np_random)
+
+    def _update_cache(self) -> None:
+        pipe = self._pipes[0]
+        self._cached.pipe0_x = pipe.x
+        self._cached.gap_center_y = pipe.gap_center_y
+        self._cached.bird_x = self._bird.x
+        self._cached.bird_y = self._bird.y
+
     def _is_bird_out_of_bounds(self) -> bool:
-        bird_x, bird_y = self._bird.x, self._bird.y
+        bird_x, bird_y = self._cached.bird_x, self._cached.bird_y
         top_line_point1, top_line_point2 = self._get_line_points('top')
         bottom_line_point1, bottom_line_point2 = self._get_line_points('bottom')
 
@@ -121,41 +199,24 @@ class FlappyBirdEnv(gym.Env):
         return not above_top_line or above_bottom_line
 
     def _is_bird_in_pipe_but_off_center(self) -> bool:
-        bird_x, bird_y = self._bird.x, self._bird.y
-        pipe = self._pipes[0]
-        gap_center_y = (pipe.bottom + pipe.height) / 2
+        cached = self._cached
+        return _in_pipe_but_off_center(cached.bird_x, cached.bird_y,
+                                       cached.pipe0_x, cached.gap_center_y)
 
-        in_pipe = pipe.x - 64 < bird_x < pipe.x + 100
-        off_center = not (gap_center_y - 40 < bird_y < gap_center_y + 40)
-
-        return in_pipe and off_center
-
-    def _calculate_distance(self) -> float:
-        bird_y = self._bird.y
-        bird_x = self._bird.x
-        pipe = self._pipes[0]
-        gap_center_y = (pipe.bottom + pipe.height) / 2
-        euclidean_distance = np.sqrt((bird_y - gap_center_y) ** 2 + (bird_x - pipe.x+150) ** 2)
-        return euclidean_distance
-
-    def _calculate_distance_reward(self) -> float:
-        bird_y = self._bird.y
-        bird_x = self._bird.x
-        pipe = self._pipes[0]
-        gap_center_y = (pipe.bottom + pipe.height) / 2
-        euclidean_distance = np.sqrt((bird_y - gap_center_y) ** 2 + (bird_x - pipe.x+150) ** 2)
-        return (410 - euclidean_distance) / 410
+    def _distance_sq(self) -> float:
+        cached = self._cached
+        return _dist_sq(cached.bird_x, cached.bird_y, cached.pipe0_x,
+                        cached.gap_center_y)
 
     def _get_line_points(self, line_type: str):
-        pipe = self._pipes[0]
+        pipe_x, gap_center_y = self._cached.pipe0_x, self._cached.gap_center_y
         sky_y = 0
         ground_y = self._base.y
-        gap_center_y = (pipe.bottom + pipe.height) / 2
 
         if line_type == 'top':
-            return [pipe.x - 500, sky_y], [pipe.x - 50, gap_center_y - 20]
+            return [pipe_x - 500, sky_y], [pipe_x - 50, gap_center_y - 20]
         elif line_type == 'bottom':
-            return [pipe.x - 500, ground_y], [pipe.x - 50, gap_center_y + 20]
+            return [pipe_x - 500, ground_y], [pipe_x - 50, gap_center_y + 20]
         else:
             raise ValueError("Invalid line type")
 
@@ -166,19 +227,11 @@ class FlappyBirdEnv(gym.Env):
         
         :param point: Tuple (x, y) for the point to check.
         :param line_point1: Tuple (x, y) for the first point on the line.
-        :param line_point2: Tuple (x, y) for the second point on the line.
+        :param line_point2: Tuple (x, y) for the second point on the line,
+        to the right of the first one.
         :return: True if the point is above the line, False if below.
         """
-        # Calculate the slope (m)
-        m = (line_point2[1] - line_point1[1]) / (line_point2[0] - line_point1[0])
-        # Calculate the y-intercept (b)
-        b = line_point1[1] - m * line_point1[0]
-        
-        # Calculate the y value of the line at the x position of the point
-        y_line_at_point_x = m * point_x + b
-        
-        # If the y value of the point is greater than the line's y value, it's above the line
-        return point_y > y_line_at_point_x
+        return _above_line(point_x, point_y, *line_point1, *line_point2)
 
     def step(self, action: ActType) -> \
             tuple[ObsType, SupportsFloat, bool, bool, Dict[str, Any]]:
@@ -228,31 +281,38 @@ class FlappyBirdEnv(gym.Env):
         add_pipe = False
         self._bird.move()
 
-        to_be_removed = []
+        bird_x = self._bird.x
+        pipes = []
         for pipe in self._pipes:
-            if pipe.x + pipe.pipe_top.get_width() < 0:
-                to_be_removed.append(pipe)
-
-            if not pipe.passed and pipe.x < self._bird.x:
+            if not pipe.passed and pipe.x < bird_x:
                 self._score += 1
                 pipe.passed = True
                 add_pipe = True
 
-            pipe.move()
+            if pipe.x + pipe.top_width >= 0:
+                pipe.move()
+                pipes.append(pipe)
+            else:
+                self._pipe_pool.append(pipe)
 
         if add_pipe:
-            self._pipes.append(Pipe(700, self.np_random))
+            pipes.append(self._spawn_pipe())
 
-        for pipe in to_be_removed:
-            self._pipes.remove(pipe)
+        self._pipes = pipes
+        self._update_cache()
 
         self._base.move()
+        self._dirty = True
 
         if self.render_mode == "human":
             self.render()
 
-        return self.observation, self.reward, self.terminated, \
-            self.truncated, self.info
+        observation = self.observation
+        terminated = self.terminated
+        reward = self._compute_reward(terminated)
+        info = self.info
+
+        return observation, reward, terminated, self.truncated, info
 
     def reset(self, *, seed: int | None = None,
               options: Dict[str, Any] | None = None) \
@@ -301,11 +361,17 @@ class FlappyBirdEnv(gym.Env):
         super().reset(seed=seed)
 
         self._background = Background()
-        self._pipes = [Pipe(700, self.np_random)]
+        if self._pipes is not None:
+            self._pipe_pool.extend(self._pipes)
+        self._pipes = [self._spawn_pipe()]
         self._base = Base(700)
         self._bird = Bird(222, 376)
+        self._update_cache()
 
         self._surface = None
+        self._dirty = True
+        self._drawn_rects = None
+        self._previous_rects = None
 
         self._last_action = 0
         self._score = 0
@@ -343,46 +409,53 @@ class FlappyBirdEnv(gym.Env):
         """
 
         if self._surface is None:
-            pygame.init()
-
+            # an off-screen surface needs no pygame subsystem, so only the
+            # human mode initializes pygame and opens a window
             if self.render_mode == "human":
+                pygame.init()
                 pygame.display.init()
                 pygame.display.set_caption("Flappy Bird")
                 self._surface = pygame.display.set_mode(self._shape)
             elif self.render_mode == "rgb_array":
                 self._surface = pygame.Surface(self._shape)
-                return self.observation
 
         assert self._surface is not None, \
             "Something went wrong with pygame. This should never happen."
 
-        self._background.draw(self._surface)
-        for pipe in self._pipes:
-            pipe.draw(self._surface)
-        self._base.draw(self._surface)
-        self._bird.draw(self._surface)
+        self._redraw()
 
         if self.render_mode == "human":
             pygame.event.pump()
-            pygame.display.update()
+            if self._previous_rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(self._previous_rects + self._drawn_rects)
             self._clock.tick(FlappyBirdEnv.metadata["render_fps"])
         elif self.render_mode == "rgb_array":
-            return self.observation
+            return self._pixels()
 
-    @property
-    @functools.cache
-    def _width(self) -> int:
-        return FlappyBirdEnv.observation_space.shape[1]
+    def _redraw(self) -> None:
+        # draw at most once per step, however many times the frame is read
+        if not self._dirty:
+            return
 
-    @property
-    @functools.cache
-    def _height(self) -> int:
-        return FlappyBirdEnv.observation_space.shape[0]
+        background = self._background.blit_sequence()
+        blit_sequence = [*background]
+        for pipe in self._pipes:
+            blit_sequence.extend(pipe.blit_sequence())
+        blit_sequence.extend(self._base.blit_sequence())
+        blit_sequence.extend(self._bird.blit_sequence())
 
-    @property
-    @functools.cache
-    def _shape(self) -> Tuple[int, int]:
-        return self._width, self._height
+        if self.render_mode == "human":
+            # the background is static, so only the areas covered by the
+            # moving sprites in this frame and the previous one need updating
+            rects = self._surface.blits(blit_sequence)
+            self._previous_rects = self._drawn_rects
+            self._drawn_rects = rects[len(background):]
+        else:
+            self._surface.blits(blit_sequence, doreturn=False)
+
+        self._dirty = False
 
     def close(self) -> None:
         """
@@ -393,6 +466,6 @@ class FlappyBirdEnv(gym.Env):
         connections.
         """
 
-        if self._surface is not None:
+        if self.render_mode == "human" and self._surface is not None:
             pygame.display.quit()
             pygame.quit()
@@ -0,0 +1,12 @@
+import functools
+import os
+
+import pygame
+
+
+@functools.cache
+def load(name: str) -> pygame.Surface:
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                        f"{name}.png")
+    raw_image = pygame.image.load(path)
+    return pygame.transform.scale2x(raw_image)
@@ -1,10 +1,11 @@
-import os
+from typing import List, Tuple
 
 import numpy as np
 import pygame
 
 from .bird import Bird
 from .drawable import Drawable
+from .images import load
 from .movable import Movable
 
 
@@ -13,44 +14,61 @@ class Pipe(Drawable, Movable):
         self.x = x
         self.rng = rng
 
-        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                            "images", "pipe.png")
-        raw_image = pygame.image.load(path)
-        self.pipe_image = pygame.transform.scale2x(raw_image)
+        self.pipe_image = load("pipe")
         self.gap = 200
         self.velocity = 5
 
         self.height = 0
         self.top = 0
         self.bottom = 0
+        self.gap_center_y = 0.0
 
         self.pipe_top = pygame.transform.flip(self.pipe_image, False, True)
         self.pipe_bottom = self.pipe_image
+        self.top_width, self.top_height = self.pipe_top.get_size()
+        self.top_mask = pygame.mask.from_surface(self.pipe_top)
+        self.bottom_mask = pygame.mask.from_surface(self.pipe_bottom)
 
         self.passed = False
         self.set_height()
 
+    def reset(self, x: int, rng: np.random.Generator) -> None:
+        self.x = x
+        self.rng = rng
+        self.passed = False
+        self.set_height()
+
     def set_height(self) -> None:
-        self.height = self.rng.integers(low=50, high=450)
-        self.top = self.height - self.pipe_top.get_height()
+        self.height = int(self.rng.integers(low=50, high=450))
+        self.top = self.height - self.top_height
         self.bottom = self.height + self.gap
+        self.gap_center_y = (self.bottom + self.height) / 2
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.pipe_top, (self.x, self.top))
-        surface.blit(self.pipe_bottom, (self.x, self.bottom))
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        return [(self.pipe_top, (self.x, self.top)),
+                (self.pipe_bottom, (self.x, self.bottom))]
 
     def move(self) -> None:
         self.x -= self.velocity
 
     def collide(self, bird: Bird) -> bool:
+        bird_x, bird_y = bird.x, round(bird.y)
+        bird_width, bird_height = bird.image_width, bird.image_height
+
+        # bounding-box rejection: skip the pixel-perfect mask test when the
+        # bird is beside the pipe or entirely inside its gap
+        if bird_x + bird_width <= self.x or \
+                bird_x >= self.x + self.top_width:
+            return False
+        if bird_y >= self.height and bird_y + bird_height <= self.bottom:
+            return False
+
         bird_mask = bird.get_mask()
-        top_mask = pygame.mask.from_surface(self.pipe_top)
-        bottom_mask = pygame.mask.from_surface(self.pipe_bottom)
 
-        top_offset = (self.x - bird.x, self.top - round(bird.y))
-        bottom_offset = (self.x - bird.x, self.bottom - round(bird.y))
+        top_offset = (self.x - bird_x, self.top - bird_y)
+        bottom_offset = (self.x - bird_x, self.bottom - bird_y)
 
-        top_collision = bird_mask.overlap(top_mask, top_offset)
-        bottom_collision = bird_mask.overlap(bottom_mask, bottom_offset)
+        top_collision = bird_mask.overlap(self.top_mask, top_offset)
+        bottom_collision = bird_mask.overlap(self.bottom_mask, bottom_offset)
 
         return bool(top_collision or bottom_collision)